@@ -1,9 +1,14 @@
 import argparse
+import bisect
 import csv
+import functools
+import importlib
 from collections import defaultdict, deque, Counter
 from datetime import datetime, time, timedelta
+from operator import itemgetter
 from pathlib import Path
 import logging
+import mmap
 import sys
 import re
 import statistics
@@ -25,6 +30,23 @@ FILA_DECOL = DADOS / "fila_decolagem.txt"
 FILA_POUSO = DADOS / "fila_pouso.txt"
 LOG_FILE = LOGS / "torre.log"
 
+VALIDADE_FMT = "%Y-%m-%d"  # pilotos.csv validade
+VALIDADE_INVALIDA = datetime(1900, 1, 1).date()  # unparseable validade counts as long expired
+POLARS_MIN_BYTES = 1024 * 1024  # smaller planos_voo.csv: the csv module beats importing polars
+NUMPY_SORT_MIN = 1000  # below this, list.sort with a key is already fast enough
+PLANOS_COLUMNS = ["voo", "origem", "destino", "etd", "eta", "aeronave", "tipo", "prioridade", "pista_pref"]
+LOG_TAIL_CHUNK = 256 * 1024  # bytes read per step when scanning the log backwards
+
+# --- Precompiled patterns for metar.txt / notam.txt ---
+_METAR_RE = re.compile(r"(\d{2}:\d{2}) .*VIS (\d+)KM")
+_NOTAM_PISTA_RE = re.compile(r"PISTA\s+(\d{2}/\d{2})\s+FECHADA\s+(\d{2}:\d{2})-(\d{2}:\d{2})(?:\s+(.*))?")
+_NOTAM_WINDOW_RE = re.compile(r"(\d{2}:\d{2})-(\d{2}:\d{2})")
+
+# --- Precompiled patterns for torre.log (relatorio) ---
+# a log line only matters to the relatorio if it contains one of these
+_RELATORIO_HIT_RE = re.compile(rb"AUTORIZADO|(?i:negado)")
+_MOTIVO_RE = re.compile(r"[nN]egad[oa]\s*[:\-]\s*(.*)")
+
 # Ensure directories exist (won't create files)
 for p in (DADOS, LOGS, REL):
     p.mkdir(parents=True, exist_ok=True)
@@ -57,52 +79,125 @@ def now_time():
     return datetime.now().time()
 
 
+@functools.lru_cache(maxsize=None)
+def optional_module(name):
+    """Import an optional dependency on first use (polars, numpy); None if it is not installed.
+    Kept out of module top level so commands that never need it don't pay the import.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _file_key(path):
+    """Cache key for a support file: (path, mtime_ns, size).
+    Parses are memoized on this key, so an edited file is re-read on the next call.
+    """
+    st = path.stat()
+    return path, st.st_mtime_ns, st.st_size
+
+
+def csv_columns(header, required, path):
+    """Index of each required column in a csv header row. Raise ValueError if one is missing."""
+    for h in required:
+        if h not in header:
+            raise ValueError(f"Arquivo {path} faltando coluna '{h}'")
+    return [header.index(h) for h in required]
+
+
 def read_planos():
     """Return list of dicts for each valid line in planos_voo.csv.
     Columns: voo,origem,destino,etd,eta,aeronave,tipo,prioridade,pista_pref
     """
     if not PLANOS.exists():
         raise FileNotFoundError(f"{PLANOS} não encontrado")
+    return list(_read_planos_cached(*_file_key(PLANOS)))
+
+
+@functools.lru_cache(maxsize=None)
+def _read_planos_cached(path, mtime_ns, size):
+    if size >= POLARS_MIN_BYTES:
+        pl = optional_module("polars")
+        if pl is not None:
+            return _read_planos_polars(path, pl)
     planos = []
     seen = set()
-    with PLANOS.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        required = ["voo", "origem", "destino", "etd", "eta", "aeronave", "tipo", "prioridade", "pista_pref"]
-        for h in required:
-            if h not in reader.fieldnames:
-                raise ValueError(f"Arquivo {PLANOS} faltando coluna '{h}'")
+    intern = sys.intern  # origem/destino/aeronave/tipo/pista_pref repeat a lot across flights
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        i_voo, i_orig, i_dest, i_etd, i_eta, i_aer, i_tipo, i_prio, i_pista = csv_columns(header, PLANOS_COLUMNS, path)
+        width = len(header)
         for row in reader:
-            voo = row["voo"].strip()
+            if not row:
+                continue
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            voo = row[i_voo].strip()
             # simple duplicate detection: same voo + same ETD
-            key = (voo, row["etd"].strip())
+            key = (voo, row[i_etd].strip())
             if key in seen:
-                logging.warning(f"Duplicidade detectada em planos_voo: {voo} {row['etd']}. Linha ignorada.")
+                logging.warning(f"Duplicidade detectada em planos_voo: {voo} {row[i_etd]}. Linha ignorada.")
                 continue
             seen.add(key)
             try:
-                row["etd_t"] = parse_hhmm(row["etd"])
-                row["eta_t"] = parse_hhmm(row["eta"])
-                row["prioridade"] = int(row["prioridade"])
+                etd_t = parse_hhmm(row[i_etd])
+                eta_t = parse_hhmm(row[i_eta])
+                prio = int(row[i_prio])
             except Exception as e:
                 logging.warning(f"Erro parse plano {voo}: {e}. Linha ignorada.")
                 continue
-            planos.append(row)
-    return planos
+            planos.append({
+                "voo": row[i_voo], "origem": intern(row[i_orig]), "destino": intern(row[i_dest]),
+                "etd": row[i_etd], "eta": row[i_eta], "aeronave": intern(row[i_aer]), "tipo": intern(row[i_tipo]),
+                "prioridade": prio, "pista_pref": intern(row[i_pista]), "etd_t": etd_t, "eta_t": eta_t,
+            })
+    return tuple(planos)
+
+
+def _read_planos_polars(path, pl):
+    """Same result as the csv path, but deduplication and ETD/ETA/prioridade parsing run vectorized."""
+    # every column as str (like csv.DictReader); empty fields stay ""
+    # truncate_ragged_lines: extra trailing fields are dropped, as the csv path's column indexes do
+    df = pl.read_csv(path, infer_schema_length=0, truncate_ragged_lines=True)
+    # blank lines come back as all-null rows; drop them silently like csv.reader's empty rows
+    df = df.filter(~pl.all_horizontal(pl.all().is_null())).fill_null("")
+    csv_columns(df.columns, PLANOS_COLUMNS, path)
+    df = df.select(PLANOS_COLUMNS)
+    # simple duplicate detection: same voo + same ETD (first line wins)
+    first = pl.struct(pl.col("voo").str.strip_chars(), pl.col("etd").str.strip_chars()).is_first_distinct()
+    for voo, etd in df.filter(~first).select("voo", "etd").iter_rows():
+        logging.warning(f"Duplicidade detectada em planos_voo: {voo.strip()} {etd}. Linha ignorada.")
+    df = df.filter(first).with_columns(
+        pl.col("etd").str.strip_chars().str.strptime(pl.Time, "%H:%M", strict=False).alias("etd_t"),
+        pl.col("eta").str.strip_chars().str.strptime(pl.Time, "%H:%M", strict=False).alias("eta_t"),
+        pl.col("prioridade").str.strip_chars().cast(pl.Int64, strict=False).alias("prioridade_i"),
+    )
+    bad = pl.any_horizontal(pl.col("etd_t").is_null(), pl.col("eta_t").is_null(), pl.col("prioridade_i").is_null())
+    for voo, etd, eta, prio in df.filter(bad).select("voo", "etd", "eta", "prioridade").iter_rows():
+        logging.warning(f"Erro parse plano {voo.strip()}: etd={etd!r} eta={eta!r} prioridade={prio!r}. Linha ignorada.")
+    df = df.filter(~bad).with_columns(pl.col("prioridade_i").alias("prioridade")).drop("prioridade_i")
+    return tuple(df.to_dicts())
 
 
 def read_pistas():
     """Return dict pista -> status ('ABERTA'|'FECHADA')"""
     if not PISTAS.exists():
         raise FileNotFoundError(f"{PISTAS} não encontrado")
+    return dict(_read_pistas_cached(*_file_key(PISTAS)))
+
+
+@functools.lru_cache(maxsize=None)
+def _read_pistas_cached(path, mtime_ns, size):
     pistas = {}
-    with PISTAS.open(encoding="utf-8") as f:
-        for ln in f:
-            ln = ln.strip()
-            if not ln:
-                continue
-            parts = [p.strip() for p in ln.split(",")]
-            if len(parts) >= 2:
-                pistas[parts[0]] = parts[1]
+    for ln in path.read_text(encoding="utf-8").splitlines():
+        ln = ln.strip()
+        if not ln:
+            continue
+        parts = [p.strip() for p in ln.split(",")]
+        if len(parts) >= 2:
+            pistas[parts[0]] = parts[1]
     return pistas
 
 
@@ -110,12 +205,27 @@ def read_frota():
     """Return dict aeronave -> comprimento_min_pista (int) and obs"""
     if not FROTA.exists():
         raise FileNotFoundError(f"{FROTA} não encontrado")
+    return dict(_read_frota_cached(*_file_key(FROTA)))
+
+
+@functools.lru_cache(maxsize=None)
+def _read_frota_cached(path, mtime_ns, size):
     d = {}
-    with FROTA.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        try:
+            i_aer, i_comp = csv_columns(header, ["aeronave", "comprimento_min_pista"], path)
+        except ValueError as e:
+            logging.warning(f"Erro em frota: {e}")
+            return d
+        i_obs = header.index("obs") if "obs" in header else None
         for r in reader:
+            if not r:
+                continue
             try:
-                d[r["aeronave"].strip()] = {"comprimento_min_pista": int(r["comprimento_min_pista"]), "obs": r.get("obs", "").strip()}
+                obs = r[i_obs].strip() if i_obs is not None else ""
+                d[sys.intern(r[i_aer].strip())] = {"comprimento_min_pista": int(r[i_comp]), "obs": obs}
             except Exception:
                 logging.warning(f"Erro no registro de frota: {r}")
     return d
@@ -125,47 +235,61 @@ def read_pilotos():
     """Return dict matricula -> data (nome,licenca,habilitacao,validade(datetime.date))"""
     if not PILOTOS.exists():
         raise FileNotFoundError(f"{PILOTOS} não encontrado")
+    return dict(_read_pilotos_cached(*_file_key(PILOTOS)))
+
+
+@functools.lru_cache(maxsize=None)
+def _read_pilotos_cached(path, mtime_ns, size):
     d = {}
-    with PILOTOS.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        i_mat, i_nome, i_lic, i_hab, i_val = csv_columns(header, ["matricula", "nome", "licenca", "habilitacao", "validade"], path)
+        width = len(header)
         for r in reader:
-            mat = r["matricula"].strip()
-            nome = r["nome"].strip()
-            lic = r["licenca"].strip()
-            hab = r["habilitacao"].strip()
+            if not r:
+                continue
+            if len(r) < width:
+                r += [""] * (width - len(r))
+            mat = r[i_mat].strip()
+            nome = r[i_nome].strip()
+            lic = sys.intern(r[i_lic].strip())
+            hab = sys.intern(r[i_hab].strip())
             try:
-                val = datetime.strptime(r["validade"].strip(), "%Y-%m-%d").date()
+                val = datetime.strptime(r[i_val].strip(), VALIDADE_FMT).date()
             except Exception:
-                # try alternative common format (YYYY or other) - if fail, set very old date
-                try:
-                    val = datetime.strptime(r["validade"].strip(), "%Y-%m-%d").date()
-                except Exception:
-                    val = datetime(1900, 1, 1).date()
+                val = VALIDADE_INVALIDA
             d[mat] = {"nome": nome, "licenca": lic, "habilitacao": hab, "validade": val}
     return d
 
 
 def read_metar():
-    """Parse metar.txt to list of (time, dict) entries. We only need VIS value in KM and time."""
+    """Parse metar.txt to list of (time, dict) entries, sorted by time. We only need VIS value in KM and time."""
     if not METAR.exists():
         raise FileNotFoundError(f"{METAR} não encontrado")
+    return list(_read_metar_cached(*_file_key(METAR)))
+
+
+@functools.lru_cache(maxsize=None)
+def _read_metar_cached(path, mtime_ns, size):
     entries = []
-    with METAR.open(encoding="utf-8") as f:
-        for ln in f:
-            ln = ln.strip()
-            if not ln:
-                continue
-            # example: "13:00 VENTO 090/12KT VIS 7KM CHUVA LEVE"
-            m = re.match(r"(\d{2}:\d{2}) .*VIS (\d+)KM", ln)
-            try:
-                t = parse_hhmm(ln.split()[0])
-            except Exception:
-                continue
-            vis = None
-            if m:
-                vis = int(m.group(2))
-            entries.append({"time": t, "raw": ln, "vis_km": vis})
-    return entries
+    for ln in path.read_text(encoding="utf-8").splitlines():
+        ln = ln.strip()
+        if not ln:
+            continue
+        # example: "13:00 VENTO 090/12KT VIS 7KM CHUVA LEVE"
+        m = _METAR_RE.match(ln)
+        try:
+            t = parse_hhmm(ln.split()[0])
+        except Exception:
+            continue
+        vis = None
+        if m:
+            vis = int(m.group(2))
+        entries.append({"time": t, "raw": ln, "vis_km": vis})
+    # sorted once here so active_metar_for_now can binary-search (stable: same-time entries keep file order)
+    entries.sort(key=itemgetter("time"))
+    return tuple(entries)
 
 
 def active_metar_for_now(current_time=None):
@@ -175,13 +299,12 @@ def active_metar_for_now(current_time=None):
     if not entries:
         return None
     # find latest entry with time <= current_time
-    candidates = [e for e in entries if e["time"] <= current_time]
-    if not candidates:
+    i = bisect.bisect_right(entries, current_time, key=itemgetter("time"))
+    if i == 0:
         # if none earlier, take earliest (wrap)
         return entries[0]
-    # pick max by time
-    best = max(candidates, key=lambda e: e["time"])
-    return best
+    # several entries with that same time: the first one in the file wins
+    return entries[bisect.bisect_left(entries, entries[i - 1]["time"], hi=i, key=itemgetter("time"))]
 
 
 def read_notams():
@@ -190,70 +313,168 @@ def read_notams():
     """
     if not NOTAM.exists():
         return []
+    return list(_read_notams_cached(*_file_key(NOTAM)))
+
+
+@functools.lru_cache(maxsize=None)
+def _read_notams_cached(path, mtime_ns, size):
     out = []
-    with NOTAM.open(encoding="utf-8") as f:
-        for ln in f:
-            ln = ln.strip()
-            if not ln:
-                continue
-            # Try to parse "PISTA 01/19 FECHADA 14:00-16:00 MANUTENCAO"
-            m = re.match(r"PISTA\s+(\d{2}/\d{2})\s+FECHADA\s+(\d{2}:\d{2})-(\d{2}:\d{2})(?:\s+(.*))?", ln)
-            if m:
-                pista = m.group(1)
-                start = parse_hhmm(m.group(2))
-                end = parse_hhmm(m.group(3))
-                text = (m.group(4) or "").strip()
-                out.append({"type": "PISTA", "pista": pista, "start": start, "end": end, "text": text, "raw": ln})
-                continue
-            # Other generic notam with time window pattern maybe "RADIO ... 15:00-15:30"
-            m2 = re.search(r"(\d{2}:\d{2})-(\d{2}:\d{2})", ln)
-            if m2:
-                start = parse_hhmm(m2.group(1))
-                end = parse_hhmm(m2.group(2))
-                out.append({"type": "GEN", "start": start, "end": end, "text": ln, "raw": ln})
-            else:
-                out.append({"type": "GEN", "text": ln, "raw": ln})
-    return out
+    for ln in path.read_text(encoding="utf-8").splitlines():
+        ln = ln.strip()
+        if not ln:
+            continue
+        # Try to parse "PISTA 01/19 FECHADA 14:00-16:00 MANUTENCAO"
+        m = _NOTAM_PISTA_RE.match(ln)
+        if m:
+            pista = m.group(1)
+            start = parse_hhmm(m.group(2))
+            end = parse_hhmm(m.group(3))
+            text = (m.group(4) or "").strip()
+            out.append({"type": "PISTA", "pista": pista, "start": start, "end": end, "text": text, "raw": ln})
+            continue
+        # Other generic notam with time window pattern maybe "RADIO ... 15:00-15:30"
+        m2 = _NOTAM_WINDOW_RE.search(ln)
+        if m2:
+            start = parse_hhmm(m2.group(1))
+            end = parse_hhmm(m2.group(2))
+            out.append({"type": "GEN", "start": start, "end": end, "text": ln, "raw": ln})
+        else:
+            out.append({"type": "GEN", "text": ln, "raw": ln})
+    return tuple(out)
+
+
+def time_to_us(t):
+    """datetime.time -> microseconds since midnight (plain int, cheap to compare)."""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
+@functools.lru_cache(maxsize=None)
+def _index_notams_cached(path, mtime_ns, size):
+    """Interval index of PISTA closures: dict pista -> (starts, ends, max_ends, notams), sorted by start.
+    Times are time_to_us ints; max_ends[i] is the latest end among the first i+1 windows.
+    Each notams item is (position in notam.txt, notam).
+    """
+    by_pista = defaultdict(list)
+    for pos, n in enumerate(_read_notams_cached(path, mtime_ns, size)):
+        if n["type"] == "PISTA" and n.get("start") and n.get("end"):
+            by_pista[n["pista"]].append((time_to_us(n["start"]), time_to_us(n["end"]), (pos, n)))
+    index = {}
+    for pista, windows in by_pista.items():
+        windows.sort(key=itemgetter(0))
+        max_ends = []
+        latest = -1
+        for _, e, _ in windows:
+            latest = max(latest, e)
+            max_ends.append(latest)
+        index[pista] = ([w[0] for w in windows], [w[1] for w in windows], max_ends, [w[2] for w in windows])
+    return index
 
 
 def notam_blocks_pista(pista, current_time=None):
-    """Return True if any NOTAM blocks the pista at current_time."""
+    """Return True if any NOTAM blocks the pista at current_time.
+    With overlapping closures, the one listed first in notam.txt is reported (same rule as cmd_status).
+    """
     current_time = current_time or now_time()
-    notams = read_notams()
-    for n in notams:
-        if n["type"] == "PISTA" and n["pista"] == pista:
-            s = n.get("start")
-            e = n.get("end")
-            if s and e:
-                if s <= current_time <= e:
-                    return True, n
-    return False, None
+    if not NOTAM.exists():
+        return False, None
+    entry = _index_notams_cached(*_file_key(NOTAM)).get(pista)
+    if not entry:
+        return False, None
+    starts, ends, max_ends, notams = entry
+    cur = time_to_us(current_time)
+    # walk back from the last window starting at or before cur; stop once no earlier window reaches cur
+    found = None
+    i = bisect.bisect_right(starts, cur) - 1
+    while i >= 0 and max_ends[i] >= cur:
+        if ends[i] >= cur and (found is None or notams[i][0] < found[0]):
+            found = notams[i]
+        i -= 1
+    if found is None:
+        return False, None
+    return True, found[1]
+
+
+# --- Log helpers ---
+
+
+def parse_log_ts(ln):
+    """Timestamp at the start of a log line ("YYYY-MM-DD HH:MM:SS") or None if absent."""
+    # fixed-width format: slice the fields instead of going through strptime
+    if len(ln) < 19 or ln[4] != "-" or ln[7] != "-" or ln[10] != " " or ln[13] != ":" or ln[16] != ":":
+        return None
+    try:
+        return datetime(int(ln[0:4]), int(ln[5:7]), int(ln[8:10]), int(ln[11:13]), int(ln[14:16]), int(ln[17:19]))
+    except ValueError:
+        return None
+
+
+def log_offset_since(path, since):
+    """Byte offset of the first log line stamped at or after `since`.
+    The file is read backwards in LOG_TAIL_CHUNK blocks and the scan stops at the first
+    older timestamp, so the cost depends on what was logged since then, not on log size.
+    Lines without timestamp (e.g. tracebacks) stay attached to the entry above them.
+    """
+    with path.open("rb") as f:
+        pos = f.seek(0, 2)
+        start = pos
+        carry = b""
+        while pos > 0:
+            step = min(LOG_TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + carry
+            lines = data.split(b"\n")
+            # first piece may be the tail of a line that starts in an earlier block
+            carry = lines.pop(0) if pos > 0 else b""
+            line_end = pos + len(data)
+            for ln in reversed(lines):
+                line_start = line_end - len(ln)
+                line_end = line_start - 1
+                ts = parse_log_ts(ln.decode("utf-8", "replace"))
+                if ts is None:
+                    continue
+                if ts < since:
+                    return start
+                start = line_start
+    return start
 
 
 # --- Queue helpers ---
 
 def load_queue(path):
-    """Load queue file as list of dicts. Format per line: voo;hora;prioridade;pista_atribuida?;tipo"""
+    """Load queue file as list of dicts. Format per line: voo;hora;prioridade;pista_atribuida?;tipo
+    Not memoized: commands rewrite the queues, and a same-size rewrite within one timestamp tick
+    would hand back a stale parse.
+    """
     out = []
     if not path.exists():
         return out
-    with path.open(encoding="utf-8") as f:
-        for ln in f:
-            ln = ln.strip()
-            if not ln:
+    with path.open(newline="", encoding="utf-8") as f:
+        # QUOTE_NONE: fields are split on ";" exactly like str.split, just in C
+        for parts in csv.reader(f, delimiter=";", quoting=csv.QUOTE_NONE):
+            if not parts:
+                continue
+            # same as stripping the whole line before splitting
+            parts[0] = parts[0].lstrip()
+            parts[-1] = parts[-1].rstrip()
+            if parts == [""]:
                 continue
-            parts = ln.split(";")
             # safe parse
             rec = {"voo": parts[0], "hora": parts[1] if len(parts) > 1 else "", "prioridade": int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0, "pista": parts[3] if len(parts) > 3 else "", "tipo": parts[4] if len(parts) > 4 else ""}
             out.append(rec)
     return out
 
 
+def queue_key(rec):
+    """Queue order: priority desc, then hour."""
+    return (-int(rec.get("prioridade", 0)), rec.get("hora", ""))
+
+
 def save_queue(path, items):
     """Items is list of dicts with keys voo,hora,prioridade,pista,tipo"""
-    with path.open("w", encoding="utf-8") as f:
-        for it in items:
-            f.write(f"{it.get('voo','')};{it.get('hora','')};{it.get('prioridade',0)};{it.get('pista','')};{it.get('tipo','')}\n")
+    # build the whole file and write it once
+    payload = "".join(f"{it.get('voo','')};{it.get('hora','')};{it.get('prioridade',0)};{it.get('pista','')};{it.get('tipo','')}\n" for it in items)
+    path.write_text(payload, encoding="utf-8")
 
 
 # --- Business rules utilities ---
@@ -294,10 +515,55 @@ def aeronave_compatível(frota_dict, aeronave, pista):
     return True, ""
 
 
+# --- Per-invocation context ---
+
+
+class TorreContext:
+    """Support data for one CLI invocation, read on first access and reused by the command.
+    The read_* functions are memoized per file signature, so this only adds the derived indexes.
+    """
+
+    @functools.cached_property
+    def planos(self):
+        return read_planos()
+
+    @functools.cached_property
+    def planos_by_voo(self):
+        return index_planos(self.planos)
+
+    @functools.cached_property
+    def pistas(self):
+        return read_pistas()
+
+    @functools.cached_property
+    def frota(self):
+        return read_frota()
+
+    @functools.cached_property
+    def pilotos(self):
+        return read_pilotos()
+
+    @functools.cached_property
+    def pilotos_by_hab(self):
+        """habilitacao (upper) -> matriculas in file order; keys keep the order of first appearance."""
+        by_hab = defaultdict(list)
+        for mat, info in self.pilotos.items():
+            by_hab[info["habilitacao"].upper()].append(mat)
+        return dict(by_hab)
+
+    @functools.cached_property
+    def metars(self):
+        return read_metar()
+
+    @functools.cached_property
+    def notams(self):
+        return read_notams()
+
+
 # --- Commands Implementation ---
 
 
-def cmd_importar_dados(args):
+def cmd_importar_dados(args, ctx=None):
     """Validate all files, precompute queues (empty), log missing, detect duplicate flights."""
     missing = []
     for p in (PLANOS, PISTAS, FROTA, PILOTOS, METAR, NOTAM):
@@ -310,13 +576,14 @@ def cmd_importar_dados(args):
         return 1
 
     # Try to read all (and validate)
+    ctx = ctx or TorreContext()
     try:
-        planos = read_planos()
-        pistas = read_pistas()
-        frota = read_frota()
-        pilotos = read_pilotos()
-        metars = read_metar()
-        notams = read_notams()
+        planos = ctx.planos
+        pistas = ctx.pistas
+        frota = ctx.frota
+        pilotos = ctx.pilotos
+        metars = ctx.metars
+        notams = ctx.notams
     except Exception as e:
         logging.error(f"Erro ao ler dados: {e}")
         print("Erro ao ler dados. Veja logs.")
@@ -334,37 +601,60 @@ def cmd_importar_dados(args):
 
 def format_table(rows, headers):
     """Simple pretty table printer."""
-    col_widths = [max(len(str(r.get(h, ""))) for r in rows + [dict(zip(headers, headers))]) for h in headers]
+    # stringify each cell once; widths come from the same strings used for output
+    str_rows = [[str(r.get(h, "")) for h in headers] for r in rows]
+    col_widths = [max(len(h), max((len(row[i]) for row in str_rows), default=0)) for i, h in enumerate(headers)]
     sep = " | "
     header_line = sep.join(h.ljust(w) for h, w in zip(headers, col_widths))
     lines = [header_line, "-".join("-" * (w + 2) for w in col_widths)]
-    for r in rows:
-        lines.append(sep.join(str(r.get(h, "")).ljust(w) for h, w in zip(headers, col_widths)))
+    for row in str_rows:
+        lines.append(sep.join(c.ljust(w) for c, w in zip(row, col_widths)))
     return "\n".join(lines)
 
 
-def cmd_listar(args):
+def lexsort_planos(planos, group):
+    """numpy equivalent of planos.sort(key=lambda r: (group[i], -r["prioridade"], r["etd_t"])).
+    group is a list aligned with planos. np.lexsort is stable, like list.sort.
+    """
+    np = optional_module("numpy")
+    n = len(planos)
+    etd = np.fromiter((r["etd_t"].hour * 60 + r["etd_t"].minute for r in planos), np.int32, n)
+    prio = np.fromiter((-r["prioridade"] for r in planos), np.int64, n)
+    order = np.lexsort((etd, prio, np.asarray(group)))  # last key is the primary one
+    return [planos[i] for i in order]
+
+
+def cmd_listar(args, ctx=None):
     """List flights from planos_voo.csv ordered by --por"""
+    ctx = ctx or TorreContext()
     try:
-        planos = read_planos()
+        planos = list(ctx.planos)
     except Exception as e:
         logging.error(f"listar: erro lendo planos: {e}")
         print("Erro lendo planos_voo.csv. Veja logs.")
         return 1
     key = args.por
+    # numpy is only imported for listings big enough to benefit from it
+    use_numpy = key in ("tipo", "prioridade") and len(planos) > NUMPY_SORT_MIN and optional_module("numpy") is not None
     if key == "voo":
-        planos.sort(key=lambda r: r["voo"])
+        planos.sort(key=itemgetter("voo"))
     elif key == "etd":
-        planos.sort(key=lambda r: r["etd_t"])
+        planos.sort(key=itemgetter("etd_t"))
     elif key == "tipo":
         # Emergencia first
         tipo_rank = {"EMERGENCIA": 0, "COMERCIAL": 1, "CARGA": 2}
-        planos.sort(key=lambda r: (tipo_rank.get(r["tipo"], 9), -r["prioridade"], r["etd_t"]))
+        if use_numpy:
+            planos = lexsort_planos(planos, [tipo_rank.get(r["tipo"], 9) for r in planos])
+        else:
+            planos.sort(key=lambda r: (tipo_rank.get(r["tipo"], 9), -r["prioridade"], r["etd_t"]))
     elif key == "prioridade":
         # show emergencias on top and then by priority desc (3->0) and etd
-        planos.sort(key=lambda r: ((r["tipo"] != "EMERGENCIA"), -r["prioridade"], r["etd_t"]))
+        if use_numpy:
+            planos = lexsort_planos(planos, [r["tipo"] != "EMERGENCIA" for r in planos])
+        else:
+            planos.sort(key=lambda r: ((r["tipo"] != "EMERGENCIA"), -r["prioridade"], r["etd_t"]))
     else:
-        planos.sort(key=lambda r: r["voo"])
+        planos.sort(key=itemgetter("voo"))
 
     # Print simplified table
     rows = []
@@ -375,39 +665,42 @@ def cmd_listar(args):
     return 0
 
 
-def find_plan_by_voo(planos, voo):
+def index_planos(planos):
+    """Return dict voo -> plano (first occurrence wins, like a linear scan would)."""
+    idx = {}
     for p in planos:
-        if p["voo"] == voo:
-            return p
-    return None
+        idx.setdefault(p["voo"], p)
+    return idx
 
 
-def cmd_enfileirar(args):
+def cmd_enfileirar(args, ctx=None):
     """Add a flight to appropriate queue (decolagem/pouso) if rules permit."""
     modo = args.op  # 'decolagem' or 'pouso'
     voo = args.voo
+    ctx = ctx or TorreContext()
     # Read data
     try:
-        planos = read_planos()
-        frota = read_frota()
-        pilotos = read_pilotos()
+        planos_by_voo = ctx.planos_by_voo
+        frota = ctx.frota
+        pilotos = ctx.pilotos
     except Exception as e:
         logging.error(f"enfileirar: erro lendo dados: {e}")
         print("Erro lendo dados. Veja logs.")
         return 1
 
-    plan = find_plan_by_voo(planos, voo)
+    plan = planos_by_voo.get(voo)
     if not plan:
         msg = f"Voo {voo} não encontrado em planos_voo.csv"
         logging.warning(msg)
         print(msg)
         return 1
 
-    # Duplicidade: if exists in any queue with same voo, reject
-    qd = load_queue(FILA_DECOL)
-    qp = load_queue(FILA_POUSO)
-    for q in (qd + qp):
-        if q["voo"] == voo:
+    # Duplicidade: if exists in any queue with same voo, reject (pouso is only read if decolagem has no hit)
+    # The loaded queues are kept so the insertion below doesn't parse the target file again.
+    queues = {}
+    for path in (FILA_DECOL, FILA_POUSO):
+        queues[path] = load_queue(path)
+        if any(q["voo"] == voo for q in queues[path]):
             msg = f"Voo {voo} já enfileirado em outra fila. Ação recusada."
             logging.warning(msg)
             print(msg)
@@ -415,11 +708,10 @@ def cmd_enfileirar(args):
 
     # For simplicity: pick a pilot by scanning pilotos and finding one with habilitacao matching aircraft
     # In real exercise pilot matricula would come from planos or user input; we'll assume first matching pilot is assigned.
-    assigned_pilot = None
-    for mat, info in pilotos.items():
-        if info["habilitacao"].upper() in plan["aeronave"].upper():
-            assigned_pilot = mat
-            break
+    # Only distinct habilitacoes are tested; since by_hab is ordered by first appearance, the first
+    # matching key holds the same pilot a scan over every pilot would pick.
+    aeronave = plan["aeronave"].upper()
+    assigned_pilot = next((mats[0] for hab, mats in ctx.pilotos_by_hab.items() if hab in aeronave), None)
     if not assigned_pilot:
         msg = f"Nenhum piloto habilitado encontrado para aeronave {plan['aeronave']}. Enfileirar negado."
         logging.warning(msg)
@@ -441,32 +733,27 @@ def cmd_enfileirar(args):
 
     # Add to appropriate file
     rec = {"voo": voo, "hora": plan["etd"], "prioridade": plan["prioridade"], "pista": plan.get("pista_pref", ""), "tipo": modo}
-    if modo == "decolagem":
-        arr = load_queue(FILA_DECOL)
-        arr.append(rec)
-        # sort by priority desc, then hour
-        arr.sort(key=lambda r: (-int(r.get("prioridade", 0)), r.get("hora", "")))
-        save_queue(FILA_DECOL, arr)
-    else:
-        arr = load_queue(FILA_POUSO)
-        arr.append(rec)
-        arr.sort(key=lambda r: (-int(r.get("prioridade", 0)), r.get("hora", "")))
-        save_queue(FILA_POUSO, arr)
+    # queue files are kept ordered by queue_key, so a binary insertion keeps them sorted
+    qpath = FILA_DECOL if modo == "decolagem" else FILA_POUSO
+    arr = queues[qpath]
+    bisect.insort(arr, rec, key=queue_key)
+    save_queue(qpath, arr)
 
     logging.info(f"enfileirar {modo} {voo}: OK (pilot {assigned_pilot}).")
     print(f"Voo {voo} enfileirado para {modo}.")
     return 0
 
 
-def cmd_autorizar(args):
+def cmd_autorizar(args, ctx=None):
     """Authorize the first eligible in the chosen queue for the selected pista."""
     modo = args.op  # decolagem or pouso
     pista = args.pista
     current = now_time()
+    ctx = ctx or TorreContext()
     # Read dynamic files
     try:
-        pistas = read_pistas()
-        notams = read_notams()
+        pistas = ctx.pistas
+        notams = ctx.notams
         met = active_metar_for_now(current)
     except Exception as e:
         logging.error(f"autorizar: erro lendo dados: {e}")
@@ -503,19 +790,16 @@ def cmd_autorizar(args):
         ten_min_ago = datetime.now() - timedelta(minutes=10)
         recent_auth = False
         if LOG_FILE.exists():
-            with LOG_FILE.open(encoding="utf-8") as f:
-                for ln in f:
+            # only the tail written in the last 10 minutes can match
+            with LOG_FILE.open("rb") as f:
+                f.seek(log_offset_since(LOG_FILE, ten_min_ago))
+                for raw in f:
+                    ln = raw.decode("utf-8", "replace")
                     if "AUTORIZADO" in ln:
-                        try:
-                            # parse timestamp at start of line format "YYYY-MM-DD HH:MM:SS"
-                            ts = ln.split(" ", 2)[:2]
-                            ts_s = " ".join(ts)
-                            tdt = datetime.strptime(ts_s, "%Y-%m-%d %H:%M:%S")
-                            if tdt >= ten_min_ago:
-                                recent_auth = True
-                                break
-                        except Exception:
-                            continue
+                        tdt = parse_log_ts(ln)
+                        if tdt and tdt >= ten_min_ago:
+                            recent_auth = True
+                            break
         if recent_auth:
             msg = "Visibilidade baixa (VIS < 6KM): já existe operação autorizada recentemente. Nova autorização negada."
             logging.info(msg)
@@ -534,10 +818,10 @@ def cmd_autorizar(args):
     # find first eligible entry in q (respecting priority, tipo emergency rule)
     # Emergency flights (tipo 'EMERGENCIA') have top precedence regardless of queue type.
     # We'll read planos to check tipo.
-    planos = read_planos()
+    planos_by_voo = ctx.planos_by_voo
     eligible_idx = None
     for idx, rec in enumerate(q):
-        plan = find_plan_by_voo(planos, rec["voo"])
+        plan = planos_by_voo.get(rec["voo"])
         if not plan:
             # cannot authorize unknown plan
             continue
@@ -566,24 +850,33 @@ def cmd_autorizar(args):
     return 0
 
 
-def cmd_status(args):
+def cmd_status(args, ctx=None):
     """Print pistas status, tamanho das filas, próximos 3 voos e ocorrências ativas"""
     out_lines = []
+    ctx = ctx or TorreContext()
+    # one clock reading for the whole status, so every section describes the same instant
+    nowt = now_time()
     try:
-        pistas = read_pistas()
+        pistas = ctx.pistas
         qd = load_queue(FILA_DECOL)
         qp = load_queue(FILA_POUSO)
-        met = active_metar_for_now()
-        notams = read_notams()
+        met = active_metar_for_now(nowt)
+        notams = ctx.notams
     except Exception as e:
         logging.error(f"status: erro lendo dados: {e}")
         print("Erro lendo arquivos de apoio. Veja logs.")
         return 1
 
+    # closures active right now, by pista (first one in notam.txt wins): one pass over the notams
+    active_by_pista = {}
+    for n in notams:
+        if n["type"] == "PISTA" and n.get("start") and n.get("end") and n["start"] <= nowt <= n["end"]:
+            active_by_pista.setdefault(n["pista"], n)
+
     out_lines.append("Pistas:")
     for p, st in pistas.items():
-        blocked, nm = notam_blocks_pista(p, now_time())
-        if blocked:
+        nm = active_by_pista.get(p)
+        if nm:
             out_lines.append(f"  {p}: {st} (BLOQUEADA POR NOTAM: {nm['raw']})")
         else:
             out_lines.append(f"  {p}: {st}")
@@ -609,7 +902,6 @@ def cmd_status(args):
 
     out_lines.append("")
     out_lines.append("NOTAMs ativos (janela de validade):")
-    nowt = now_time()
     any_active = False
     for n in notams:
         s = n.get("start")
@@ -625,28 +917,50 @@ def cmd_status(args):
     return 0
 
 
-def cmd_relatorio(args):
-    """Generate a simple report of the day based on logs: counts authorized, denied, reasons, avg wait (approx)."""
+def parse_desde(s):
+    """Parse --desde value: YYYY-MM-DD or 'YYYY-MM-DD HH:MM[:SS]'."""
+    try:
+        return datetime.fromisoformat(s.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data/hora inválida: '{s}' (use AAAA-MM-DD ou 'AAAA-MM-DD HH:MM')")
+
+
+def cmd_relatorio(args, ctx=None):
+    """Generate a simple report of the day based on logs: counts authorized, denied, reasons, avg wait (approx).
+    With --desde, only log entries from that moment on are considered.
+    """
     date_tag = datetime.now().strftime("%Y%m%d")
     out_file = REL / f"operacao_{date_tag}.txt"
     stats = {"autorizadas": 0, "negadas": 0}
     motivos = Counter()
     wait_times = []
     # We'll parse log to collect AUTHORIZADO and NEGADO lines
-    if LOG_FILE.exists():
-        with LOG_FILE.open(encoding="utf-8") as f:
-            for ln in f:
+    if LOG_FILE.exists() and LOG_FILE.stat().st_size:
+        start = log_offset_since(LOG_FILE, args.desde) if args.desde else 0
+        with LOG_FILE.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # the regex scans the whole mapping in one pass; only lines with a hit are decoded
+            line_end = -1
+            for hit in _RELATORIO_HIT_RE.finditer(mm, start):
+                if hit.start() <= line_end:
+                    continue  # another hit on a line already counted
+                line_start = mm.rfind(b"\n", 0, hit.start()) + 1
+                line_end = mm.find(b"\n", hit.end())
+                if line_end < 0:
+                    line_end = len(mm)
+                ln = mm[line_start:line_end].decode("utf-8", "replace")
                 if "AUTORIZADO" in ln:
                     stats["autorizadas"] += 1
                 if "negado" in ln.lower() or "NEGADO" in ln:
                     stats["negadas"] += 1
                     # capture reason after "negado:" or "NEGADO"
-                    m = re.search(r"[nN]egad[oa]\s*[:\-]\s*(.*)", ln)
+                    m = _MOTIVO_RE.search(ln)
                     if m:
                         motivos[m.group(1).strip()] += 1
     # Average wait cannot be computed precisely without timestamps per flight; we'll place placeholder
     with out_file.open("w", encoding="utf-8") as f:
         f.write(f"Relatorio de Operação - {datetime.now().isoformat()}\n")
+        if args.desde:
+            f.write(f"Desde: {args.desde.isoformat(sep=' ')}\n")
         f.write(f"Autorizadas: {stats['autorizadas']}\n")
         f.write(f"Negadas: {stats['negadas']}\n")
         f.write("\nMotivos mais comuns (top 10):\n")
@@ -687,11 +1001,13 @@ def main():
     p_sta.set_defaults(func=cmd_status)
 
     p_rel = sub.add_parser("relatorio", help="Gerar relatório do turno")
+    p_rel.add_argument("--desde", type=parse_desde, default=None, help="Considerar apenas o log a partir de AAAA-MM-DD [HH:MM]")
     p_rel.set_defaults(func=cmd_relatorio)
 
     args = parser.parse_args()
     try:
-        rc = args.func(args)
+        # one context per invocation: each support file is parsed at most once
+        rc = args.func(args, TorreContext())
         sys.exit(rc if isinstance(rc, int) else 0)
     except Exception as e:
         logging.exception(f"Erro ao executar comando {args.cmd if hasattr(args,'cmd') else '??'}: {e}")